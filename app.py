@@ -10,6 +10,7 @@ from app_modules import (
     excel_filler,
     template_loader,
     download,
+    profiling,
 )
 
 # Sidebar page mapping
@@ -31,7 +32,17 @@ def main():
     choice = st.sidebar.radio("Velg side:", list(PAGES.keys()))
 
     page = PAGES[choice]
-    page.run()
+
+    # Hidden switch: only shown when the URL has ?profile=1
+    profile = profiling.is_enabled()
+    if st.query_params.get("profile") == "1":
+        profile = st.sidebar.checkbox("Profilering", value=profile)
+
+    if profile:
+        with profiling.profile_run(page.__name__.rsplit(".", 1)[-1]):
+            page.run()
+    else:
+        page.run()
 
 if __name__ == "__main__":
     main()
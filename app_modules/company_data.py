@@ -1,8 +1,14 @@
 import streamlit as st
 import requests
-
-BRREG_SEARCH_URL = "https://data.brreg.no/enhetsregisteret/api/enheter"
-BRREG_ENTITY_URL = "https://data.brreg.no/enhetsregisteret/api/enheter/{}"
+import os
+
+# Endpoints can be overridden through environment variables (e.g. for load tests)
+BRREG_SEARCH_URL = os.environ.get(
+    "BRREG_SEARCH_URL", "https://data.brreg.no/enhetsregisteret/api/enheter"
+)
+BRREG_ENTITY_URL = os.environ.get(
+    "BRREG_ENTITY_URL", "https://data.brreg.no/enhetsregisteret/api/enheter/{}"
+)
 
 
 # ---------------------------------------------------------
@@ -1,10 +1,35 @@
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Alignment
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.writer.excel import ExcelWriter
+from zipfile import ZipFile, ZIP_STORED, ZIP_DEFLATED
 from io import BytesIO
+from datetime import datetime, timezone
+import inspect
+import os
+import queue
 import re
+import threading
+
+from app_modules import profiling
 
 TARGET_FILL_HEX = "F2F2F2"   # Light gray fill used to mark fillable cells
 
+# Zip settings per output profile: (compression, compresslevel).
+# "default" is openpyxl's own setting (deflate, zlib default level).
+COMPRESSION_PROFILES = {
+    "default": (ZIP_DEFLATED, None),
+    "stored": (ZIP_STORED, None),
+    "fast": (ZIP_DEFLATED, 1),
+    "max": (ZIP_DEFLATED, 9),
+}
+
+# Parts in formats that are already compressed; deflating them again only
+# costs time, so they are always written stored. Everything else (XML,
+# vbaProject.bin, printer settings, EMF/WMF/BMP images, ...) follows the
+# chosen profile.
+PRECOMPRESSED_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".tif", ".tiff", ".wdp")
+
 
 # ---------------------------------------------------------
 # Helper: Extract RGB hex from cell fill
@@ -39,6 +64,18 @@ def _normalize_label(t):
     return re.sub(r"[^a-zA-Z0-9æøåÆØÅ]+", " ", (t or "").lower()).strip()
 
 
+# ---------------------------------------------------------
+# Helper: Store outside text as text, never as a formula
+# ---------------------------------------------------------
+def _set_text(cell, value):
+    # openpyxl turns any string starting with "=" into a live formula;
+    # values from PDFs / APIs must stay plain strings.
+    cell.value = value
+    if cell.data_type == "f":
+        cell.data_type = "s"
+    return cell
+
+
 # ---------------------------------------------------------
 # FIELD KEYWORDS (mapping logic)
 # ---------------------------------------------------------
@@ -61,6 +98,7 @@ FIELD_KEYWORDS = {
 # ---------------------------------------------------------
 # STEP A: Scan template and find fillable cells
 # ---------------------------------------------------------
+@profiling.watch
 def scan_template(template_bytes):
     wb = load_workbook(BytesIO(template_bytes), data_only=False)
     mapping = {}
@@ -100,12 +138,233 @@ def scan_template(template_bytes):
     return mapping
 
 
+# ---------------------------------------------------------
+# Pool of pre-loaded template workbooks
+# ---------------------------------------------------------
+def _load_template_workbook(template_bytes):
+    return load_workbook(BytesIO(template_bytes))
+
+
+def _refill_worker(template_bytes, q, slots, closed):
+    # Holds no reference to the pool itself, so an unused pool can be
+    # garbage-collected; its __del__ then stops this thread.
+    while True:
+        slots.acquire()  # blocks until a workbook has been taken
+        if closed.is_set():
+            return
+        q.put(_load_template_workbook(template_bytes))
+
+
+class TemplatePool:
+    """
+    Keeps `size` freshly loaded copies of the template ready to fill,
+    so a fill does not pay for load_workbook itself.
+
+    With background=True a worker thread loads a replacement each time
+    an instance is taken (and sleeps otherwise). With background=False
+    the pool is filled once and fills fall back to a direct load when it
+    runs dry. The pool is thread-safe and meant to be shared by all
+    sessions using the same template.
+    """
+
+    def __init__(self, template_bytes, size=4, background=True):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        # Set up before scan_template, which raises on a bad template
+        self._queue = queue.Queue(maxsize=size)
+        self._closed = threading.Event()
+        self._slots = threading.Semaphore(size if background else 0)
+        self._worker = None
+
+        self.template_bytes = template_bytes
+        self.size = size
+        self.background = background
+        self.mapping = scan_template(template_bytes)
+
+        if background:
+            self._worker = threading.Thread(
+                target=_refill_worker,
+                args=(template_bytes, self._queue, self._slots, self._closed),
+                name="template-pool",
+                daemon=True,
+            )
+            self._worker.start()
+        else:
+            for _ in range(size):
+                self._queue.put(_load_template_workbook(template_bytes))
+
+    def get(self):
+        """Returns a fresh workbook; loads one directly if the pool is empty."""
+        try:
+            wb = self._queue.get_nowait()
+        except queue.Empty:
+            return _load_template_workbook(self.template_bytes)
+
+        if self.background:
+            self._slots.release()  # let the worker load a replacement
+        return wb
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._slots.release()  # wake the worker so it can exit
+        if self._worker and self._worker is not threading.current_thread():
+            self._worker.join()
+
+    def __del__(self):
+        # Don't wait for a load in progress during garbage collection
+        closed = getattr(self, "_closed", None)
+        if closed is not None and not closed.is_set():
+            self._closed.set()
+            self._slots.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------------------------------------
+# Helper: Zip archive that keeps precompressed images stored
+# ---------------------------------------------------------
+class _ProfiledZipFile(ZipFile):
+    def _compress_type_for(self, name):
+        if str(name).lower().endswith(PRECOMPRESSED_SUFFIXES):
+            return ZIP_STORED
+        return None  # archive default (= chosen profile)
+
+    def writestr(self, zinfo_or_arcname, data, compress_type=None, compresslevel=None):
+        name = getattr(zinfo_or_arcname, "filename", zinfo_or_arcname)
+        if compress_type is None:
+            compress_type = self._compress_type_for(name)
+        super().writestr(zinfo_or_arcname, data, compress_type, compresslevel)
+
+    def write(self, filename, arcname=None, compress_type=None, compresslevel=None):
+        if compress_type is None:
+            compress_type = self._compress_type_for(arcname or filename)
+        super().write(filename, arcname, compress_type, compresslevel)
+
+
+# ---------------------------------------------------------
+# Helper: File-like adapter that pushes chunks into a generator
+# ---------------------------------------------------------
+class _GeneratorWriter:
+    """
+    Contract for generator targets:
+    - the generator may be passed unprimed (it is advanced to its first
+      `yield` here) or already primed
+    - each chunk is sent with .send(chunk)
+    - end of data is signalled with .close() (GeneratorExit at the yield)
+    - if writing fails, the error is thrown into the generator instead,
+      so it can discard the partial output
+    - a generator that returns before the end raises RuntimeError
+    """
+
+    def __init__(self, gen):
+        self._gen = gen
+        self._stopped = False
+        if inspect.getgeneratorstate(gen) == inspect.GEN_CREATED:
+            next(gen)
+
+    def write(self, data):
+        if self._stopped:
+            return len(data)  # already reported; ignore ZipFile cleanup writes
+        try:
+            self._gen.send(bytes(data))
+        except StopIteration:
+            self._stopped = True
+            raise RuntimeError(
+                "Output generator stopped before the workbook was fully written"
+            ) from None
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self._gen.close()
+
+    def abort(self, exc):
+        try:
+            self._gen.throw(exc)
+        except BaseException:
+            pass
+
+
+# ---------------------------------------------------------
+# Helper: Write workbook to the chosen target with the chosen profile
+# ---------------------------------------------------------
+def _save_workbook(wb, target, compression):
+    if compression not in COMPRESSION_PROFILES:
+        raise ValueError(
+            f"Unknown compression profile {compression!r}, "
+            f"expected one of {sorted(COMPRESSION_PROFILES)}"
+        )
+
+    zip_type, level = COMPRESSION_PROFILES[compression]
+    wb.properties.modified = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+    archive = _ProfiledZipFile(
+        target, "w", zip_type, allowZip64=True, compresslevel=level
+    )
+    ExcelWriter(wb, archive).save()
+
+
+# ---------------------------------------------------------
+# Helper: Dispatch on output target
+# ---------------------------------------------------------
+def _write_output(wb, output, compression):
+    if output is None:
+        out = BytesIO()
+        _save_workbook(wb, out, compression)
+        return out.getvalue()
+
+    if isinstance(output, (str, os.PathLike)) or hasattr(output, "write"):
+        _save_workbook(wb, output, compression)
+        return None
+
+    if hasattr(output, "send"):
+        writer = _GeneratorWriter(output)
+        try:
+            _save_workbook(wb, writer, compression)
+        except Exception as e:
+            writer.abort(e)
+            raise
+        writer.close()
+        return None
+
+    raise TypeError(f"Unsupported output target: {type(output).__name__}")
+
+
 # ---------------------------------------------------------
 # STEP B: Fill the workbook
 # ---------------------------------------------------------
-def fill_excel(template_bytes, field_values, summary_text):
-    wb = load_workbook(BytesIO(template_bytes))
-    mapping = scan_template(template_bytes)
+@profiling.watch
+def fill_excel(template_bytes, field_values, summary_text, output=None, compression="default", pool=None):
+    """
+    Fills the template and writes the result to `output`:
+    - None: returns the Excel file as bytes
+    - str / PathLike: writes the file to that path
+    - file object: writes into it (it is not closed)
+    - generator: each written chunk is sent to it with .send(); it is
+      closed (GeneratorExit) after the last chunk. See _GeneratorWriter
+      for the full contract.
+
+    `compression` is one of COMPRESSION_PROFILES ("default", "stored",
+    "fast", "max"). It applies to every part except already-compressed
+    images, which are always stored.
+
+    If a TemplatePool for the same template is given, the workbook and
+    the cell mapping are taken from it instead of being loaded again.
+    """
+    if pool is not None:
+        wb = pool.get()
+        mapping = pool.mapping
+    else:
+        wb = load_workbook(BytesIO(template_bytes))
+        mapping = scan_template(template_bytes)
 
     first_sheet = wb.sheetnames[0]
     ws_first = wb[first_sheet]
@@ -116,7 +375,7 @@ def fill_excel(template_bytes, field_values, summary_text):
 
         for field, coord in sheet_map.items():
             if field in field_values and field_values[field]:
-                ws[coord].value = str(field_values[field])
+                _set_text(ws[coord], str(field_values[field]))
 
     # Insert summary into first sheet
     if summary_text:
@@ -125,7 +384,7 @@ def fill_excel(template_bytes, field_values, summary_text):
         for row in ws_first.iter_rows():
             for cell in row:
                 if isinstance(cell.value, str) and "skriv her" in cell.value.lower():
-                    cell.value = summary_text
+                    _set_text(cell, summary_text)
                     cell.alignment = Alignment(wrap_text=True, vertical="top")
                     placed = True
                     break
@@ -134,14 +393,48 @@ def fill_excel(template_bytes, field_values, summary_text):
 
         # Fallback location
         if not placed:
-            ws_first["A46"] = summary_text
+            _set_text(ws_first["A46"], summary_text)
             ws_first["A46"].alignment = Alignment(wrap_text=True, vertical="top")
 
     # Return final Excel bytes
-    out = BytesIO()
-    wb.save(out)
-    out.seek(0)
-    return out.getvalue()
+    return _write_output(wb, output, compression)
+
+
+# ---------------------------------------------------------
+# ROSTER: one row per company, streamed with write_only
+# ---------------------------------------------------------
+def _roster_value(ws, value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    value = str(value)
+    if value.startswith("="):
+        return _set_text(WriteOnlyCell(ws), value)
+    return value
+
+
+def write_roster(rows, output=None, compression="default", sheet_title="Oversikt"):
+    """
+    Writes an overview workbook with one row per company from an iterable
+    of merged field dicts (as built on the main page). Columns follow
+    FIELD_KEYWORDS. Text is always written as text, so values starting
+    with "=" never become formulas. The sheet is written in write_only mode, so memory use
+    does not grow with the number of rows.
+
+    `output` and `compression` work as in fill_excel.
+    """
+
+    columns = list(FIELD_KEYWORDS)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    ws.append([FIELD_KEYWORDS[field][0].capitalize() for field in columns])
+
+    for row in rows:
+        ws.append([_roster_value(ws, row.get(field)) for field in columns])
+
+    return _write_output(wb, output, compression)
 
 
 # ---------------------------------------------------------
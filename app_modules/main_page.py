@@ -5,8 +5,33 @@ from app_modules.template_loader import load_template
 from app_modules.company_data import fetch_company_by_org, format_company_data
 from app_modules.summary import generate_company_summary
 from app_modules.pdf_parser import extract_fields_from_pdf
-from app_modules.excel_filler import fill_excel
+from app_modules.excel_filler import fill_excel, TemplatePool
 from app_modules.download import download_excel_file
+from app_modules import profiling
+import hashlib
+import os
+
+# Template pool settings. TEMPLATE_POOL_SIZE=0 turns the pool off;
+# TEMPLATE_POOL_BACKGROUND=0 fills it once instead of refilling on a thread.
+TEMPLATE_POOL_SIZE = int(os.environ.get("TEMPLATE_POOL_SIZE", "2"))
+TEMPLATE_POOL_BACKGROUND = os.environ.get("TEMPLATE_POOL_BACKGROUND", "1").lower() in ("1", "true", "yes")
+
+
+# ---------------------------------------------------------
+# One template pool per process, shared by all sessions
+# ---------------------------------------------------------
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _shared_template_pool(template_hash, _template_bytes):
+    return TemplatePool(
+        _template_bytes, size=TEMPLATE_POOL_SIZE, background=TEMPLATE_POOL_BACKGROUND
+    )
+
+
+def _template_pool(template_bytes):
+    if TEMPLATE_POOL_SIZE < 1:
+        return None
+    template_hash = hashlib.sha256(template_bytes).hexdigest()
+    return _shared_template_pool(template_hash, template_bytes)
 
 
 def run():
@@ -52,6 +77,8 @@ def run():
     # ---------------------------------------------------------
     pdf_fields = extract_fields_from_pdf(pdf_bytes) if pdf_bytes else {}
 
+    profiling.tag(template_bytes=template_bytes, pdf_bytes=pdf_bytes)
+
     # ---------------------------------------------------------
     # MERGE FIELDS
     # ---------------------------------------------------------
@@ -91,6 +118,8 @@ def run():
                 template_bytes=template_bytes,
                 field_values=merged_fields,
                 summary_text=summary_text,
+                # The pool loads on its own thread, which a profile would miss
+                pool=None if profiling.is_active() else _template_pool(template_bytes),
             )
 
         download_excel_file(
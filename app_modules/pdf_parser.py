@@ -3,6 +3,8 @@ import pdfplumber
 import re
 from io import BytesIO
 
+from app_modules import profiling
+
 # ---------------------------------------------------------
 # REGEX PATTERNS
 # ---------------------------------------------------------
@@ -40,23 +42,33 @@ DEADLINE_RE = re.compile(
 # PDF TEXT EXTRACTION
 # ---------------------------------------------------------
 
+@profiling.watch
+def read_pdf_text(pdf_bytes: bytes) -> str:
+    """
+    Extracts text from the first 6 pages of a PDF.
+    Raises if the PDF cannot be parsed (corrupt / truncated files).
+    """
+
+    text = ""
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        for page in pdf.pages[:6]:
+            extracted = page.extract_text()
+            if extracted:
+                text += extracted + "\n"
+    return text
+
+
 def extract_text_from_pdf(pdf_bytes: bytes) -> str:
     """
     Extracts text from the first 6 pages of a PDF.
-    Returns a single string.
+    Returns a single string ("" if the PDF cannot be read).
     """
 
     if not pdf_bytes:
         return ""
 
     try:
-        text = ""
-        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-            for page in pdf.pages[:6]:
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
-        return text
+        return read_pdf_text(pdf_bytes)
 
     except Exception:
         return ""
@@ -76,7 +88,14 @@ def extract_fields_from_pdf(pdf_bytes: bytes) -> dict:
     - deadline
     """
 
-    txt = extract_text_from_pdf(pdf_bytes)
+    return extract_fields_from_text(extract_text_from_pdf(pdf_bytes))
+
+
+def extract_fields_from_text(txt: str) -> dict:
+    """
+    Same as extract_fields_from_pdf, for text that is already extracted.
+    """
+
     fields = {}
 
     if not txt:
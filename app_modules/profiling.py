@@ -0,0 +1,274 @@
+import cProfile
+import functools
+import hashlib
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+# Turn on with PIPELINE_PROFILE=1 (every run) or ?profile=1 in the app URL
+# (shows a sidebar switch). Results are written to PIPELINE_PROFILE_DIR.
+PROFILE_ENV = "PIPELINE_PROFILE"
+PROFILE_DIR = os.environ.get("PIPELINE_PROFILE_DIR", "profiles")
+
+# Functions reported separately in the summary (decorated with @watch).
+# read_pdf_text covers both the app (via extract_text_from_pdf) and ingest.
+WATCHED_FUNCTIONS = ["scan_template", "fill_excel", "read_pdf_text"]
+
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples for the flamegraph
+TOP_N = 15
+
+# Allocation sites are taken from the first SITE_CALLS calls of each watched
+# function; each one costs two snapshots inside the profiled window
+SITE_CALLS = 3
+
+_local = threading.local()
+
+# Keep the profiler's own snapshots out of the allocation sites
+_SELF_FILES = {tracemalloc.__file__, __file__}
+
+# tracemalloc peaks are process-wide, so only one run is profiled at a
+# time; other sessions wait for it to finish
+_run_lock = threading.Lock()
+
+
+def is_enabled():
+    return os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def is_active():
+    """True while a profiled run is active on this thread."""
+    return getattr(_local, "run", None) is not None
+
+
+def _short_hash(data):
+    if not data:
+        return "none"
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+# ---------------------------------------------------------
+# TAGGING (no-op unless a profiled run is active)
+# ---------------------------------------------------------
+def tag(template_bytes=None, pdf_bytes=None, pdf_digests=None):
+    """
+    Records template / PDF hashes for the active profiled run, if any.
+    Batch jobs pass `pdf_digests` (the sha256 of every processed PDF);
+    the run is then tagged with one hash over all of them.
+    """
+    run = getattr(_local, "run", None)
+    if run is None:
+        return
+    if template_bytes is not None:
+        run["template"] = _short_hash(template_bytes)
+    if pdf_bytes is not None:
+        run["pdf"] = _short_hash(pdf_bytes)
+    if pdf_digests:
+        run["pdf"] = "batch" + _short_hash("".join(sorted(pdf_digests)).encode())
+
+
+# ---------------------------------------------------------
+# PER-FUNCTION ALLOCATIONS (no-op unless a profiled run is active)
+# ---------------------------------------------------------
+def watch(func):
+    """
+    Records the tracemalloc peak of each call to `func` during a profiled
+    run, plus before/after snapshots of its first SITE_CALLS calls. The
+    snapshots are diffed after the profiler stops. Outside a profiled run
+    it only checks a thread-local and calls through.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        run = getattr(_local, "run", None)
+        if run is None:
+            return func(*args, **kwargs)
+
+        stats = run["functions"].setdefault(
+            func.__name__, {"calls": 0, "max_peak": 0, "snapshots": []}
+        )
+        stats["calls"] += 1
+        before = None
+        if stats["calls"] <= SITE_CALLS:
+            with run["sampler"].paused():
+                before = tracemalloc.take_snapshot()
+
+        stack = run["call_stack"]
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        frame = {"start": current, "peak": current}
+        stack.append(frame)
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            stack.pop()
+            frame["peak"] = max(frame["peak"], peak)
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], frame["peak"])
+            tracemalloc.reset_peak()
+            stats["max_peak"] = max(stats["max_peak"], frame["peak"] - frame["start"])
+
+            if before is not None:
+                with run["sampler"].paused():
+                    stats["snapshots"].append((before, tracemalloc.take_snapshot()))
+
+    return wrapper
+
+
+# ---------------------------------------------------------
+# STACK SAMPLER (collapsed stacks, flamegraph-ready)
+# ---------------------------------------------------------
+class _StackSampler(threading.Thread):
+    def __init__(self, thread_id):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+        self._paused = threading.Event()
+
+    @contextmanager
+    def paused(self):
+        """Skips samples while the profiler does its own bookkeeping."""
+        self._paused.set()
+        try:
+            yield
+        finally:
+            self._paused.clear()
+
+    def run(self):
+        while not self._stop_event.wait(SAMPLE_INTERVAL):
+            if self._paused.is_set():
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# ---------------------------------------------------------
+# REPORT WRITERS
+# ---------------------------------------------------------
+def _watched_cpu_report(profiler):
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out).sort_stats("cumulative")
+    for name in WATCHED_FUNCTIONS:
+        out.write(f"\n=== {name} ===\n")
+        stats.print_stats(rf"\({name}\)")
+    return out.getvalue()
+
+
+def _allocation_sites(snapshots):
+    sites = Counter()
+    for before, after in snapshots:
+        for diff in after.compare_to(before, "lineno"):
+            if diff.size_diff > 0 and diff.traceback[0].filename not in _SELF_FILES:
+                sites[str(diff.traceback[0])] += diff.size_diff
+    return sites
+
+
+def _watched_alloc_report(functions):
+    lines = []
+    for name in WATCHED_FUNCTIONS:
+        stats = functions.get(name)
+        lines.append(f"\n=== Allocations in {name} ===")
+        if not stats:
+            lines.append("not called")
+            continue
+        lines.append(
+            f"{stats['calls']} calls, peak {stats['max_peak'] / 1024:.1f} KiB above entry"
+        )
+        lines.append(
+            f"Top sites (KiB allocated and still held on return, "
+            f"summed over the first {len(stats['snapshots'])} calls):"
+        )
+        for site, size in _allocation_sites(stats["snapshots"]).most_common(TOP_N):
+            lines.append(f"    {size / 1024:9.1f}  {site}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_outputs(prefix, profiler, sampler, before, after, functions):
+    profiler.dump_stats(prefix + ".pstats")
+
+    with open(prefix + ".collapsed", "w", encoding="utf-8") as f:
+        for stack, count in sampler.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    with open(prefix + ".memdiff.txt", "w", encoding="utf-8") as f:
+        for stat in after.compare_to(before, "lineno")[:50]:
+            f.write(f"{stat}\n")
+
+    with open(prefix + ".summary.txt", "w", encoding="utf-8") as f:
+        f.write(_watched_cpu_report(profiler))
+        f.write(_watched_alloc_report(functions))
+
+
+# ---------------------------------------------------------
+# PROFILED RUN
+# ---------------------------------------------------------
+@contextmanager
+def profile_run(label="run"):
+    """
+    Profiles the enclosed block with cProfile, a stack sampler and
+    tracemalloc, then writes to PROFILE_DIR:
+    - <prefix>.pstats       cProfile stats
+    - <prefix>.collapsed    collapsed stacks for flamegraph.pl / speedscope
+    - <prefix>.memdiff.txt  tracemalloc snapshot diff (end vs start)
+    - <prefix>.summary.txt  CPU time, allocation peak and allocation sites
+                            of WATCHED_FUNCTIONS (recorded per call by @watch)
+
+    Only this thread is profiled, so callers should avoid handing watched
+    work to other threads (e.g. a TemplatePool) while is_active().
+    Profiled runs are serialized across threads, because tracemalloc
+    peaks are process-wide.
+    The prefix carries the template and PDF hashes recorded with tag().
+    """
+
+    with _run_lock:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(25)
+        before = tracemalloc.take_snapshot()
+
+        sampler = _StackSampler(threading.get_ident())
+        profiler = cProfile.Profile()
+        run = {
+            "template": "none", "pdf": "none", "call_stack": [], "functions": {},
+            "sampler": sampler,
+        }
+        _local.run = run
+        sampler.start()
+        profiler.enable()
+
+        try:
+            yield run
+        finally:
+            profiler.disable()
+            sampler.stop()
+            _local.run = None
+            after = tracemalloc.take_snapshot()
+
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            prefix = os.path.join(
+                PROFILE_DIR, f"{stamp}_{label}_t-{run['template']}_p-{run['pdf']}"
+            )
+            _write_outputs(prefix, profiler, sampler, before, after, run["functions"])
+            if started_tracing:
+                tracemalloc.stop()
@@ -1,7 +1,14 @@
 import streamlit as st
 import requests
+import os
 import re
 
+# Endpoints can be overridden through environment variables (e.g. for load tests)
+WIKIPEDIA_SUMMARY_URL = os.environ.get(
+    "WIKIPEDIA_SUMMARY_URL", "https://no.wikipedia.org/api/rest_v1/page/summary/{}"
+)
+DUCKDUCKGO_URL = os.environ.get("DUCKDUCKGO_URL", "https://api.duckduckgo.com/")
+
 
 def _clean_text(t: str) -> str:
     """Remove weird whitespace and shorten long text."""
@@ -67,7 +74,7 @@ def summary_from_wikipedia(name: str) -> str:
         return ""
 
     try:
-        url = f"https://no.wikipedia.org/api/rest_v1/page/summary/{name}"
+        url = WIKIPEDIA_SUMMARY_URL.format(name)
         r = requests.get(url, timeout=10)
 
         if r.status_code == 200:
@@ -93,8 +100,7 @@ def summary_from_duckduckgo(query: str) -> str:
         return ""
 
     try:
-        url = "https://api.duckduckgo.com/"
-        r = requests.get(url, params={"q": query, "format": "json"}, timeout=10)
+        r = requests.get(DUCKDUCKGO_URL, params={"q": query, "format": "json"}, timeout=10)
 
         if r.status_code == 200:
             abstract = r.json().get("AbstractText", "")
@@ -1,14 +1,24 @@
 import streamlit as st
 import requests
+import os
+
+# Can be overridden through the environment (e.g. for load tests)
+TEMPLATE_URL = os.environ.get(
+    "TEMPLATE_URL",
+    "https://docs.google.com/spreadsheets/d/e/2PACX-1vQZgo_lI3n1uTuOz6DzJnKUU--_Cs991MzQ_NNtkqxUmEq5k8W6Qki_O0hwngLVxHoD9GcAxRG-mq7w/pub?output=xlsx",
+)
+
+
+def fetch_template_bytes():
+    """Downloads the Excel template. Raises on HTTP errors."""
+    response = requests.get(TEMPLATE_URL, timeout=30)
+    response.raise_for_status()
+    return response.content  # <-- THIS is what fill_excel needs
 
-TEMPLATE_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQZgo_lI3n1uTuOz6DzJnKUU--_Cs991MzQ_NNtkqxUmEq5k8W6Qki_O0hwngLVxHoD9GcAxRG-mq7w/pub?output=xlsx"
 
 def load_template():
     try:
-        response = requests.get(TEMPLATE_URL)
-        response.raise_for_status()
-
-        template_bytes = response.content  # <-- THIS is what fill_excel needs
+        template_bytes = fetch_template_bytes()
 
         st.session_state["template_bytes"] = template_bytes
         st.success("Excel template loaded from Google Sheets")
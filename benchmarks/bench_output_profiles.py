@@ -0,0 +1,41 @@
+"""
+Benchmark: write time and output size of fill_excel per compression profile.
+
+Usage:
+    python -m benchmarks.bench_output_profiles [template.xlsx] [runs]
+"""
+import sys
+import time
+
+from app_modules.excel_filler import fill_excel, COMPRESSION_PROFILES
+
+DEFAULT_TEMPLATE = "Filled in with Tangen-Bygg-AS.xlsx"
+
+SAMPLE_FIELDS = {
+    "company_name": "Tangen Bygg AS",
+    "org_number": "123456789",
+    "address": "Storgata 1",
+    "post_nr": "0155",
+    "city": "Oslo",
+    "employees": "42",
+}
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TEMPLATE
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with open(path, "rb") as f:
+        template_bytes = f.read()
+
+    print(f"{'profile':<8} {'ms/fill':>10} {'bytes':>10}")
+    for profile in COMPRESSION_PROFILES:
+        start = time.perf_counter()
+        for _ in range(runs):
+            out = fill_excel(template_bytes, SAMPLE_FIELDS, "Sammendrag", compression=profile)
+        ms = (time.perf_counter() - start) * 1000 / runs
+        print(f"{profile:<8} {ms:>10.1f} {len(out):>10}")
+
+
+if __name__ == "__main__":
+    main()
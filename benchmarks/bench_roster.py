@@ -0,0 +1,58 @@
+"""
+Benchmark: rows per second and memory of write_roster at 10k and 100k rows.
+
+Rows are generated lazily and the workbook goes to a temp file, so the
+peak RSS should stay flat as the row count grows.
+
+Usage:
+    python -m benchmarks.bench_roster [row counts ...]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from app_modules.excel_filler import write_roster
+
+
+def _rows(n):
+    for i in range(n):
+        yield {
+            "company_name": f"Bedrift {i} AS",
+            "org_number": str(900000000 + i),
+            "address": f"Storgata {i % 200 + 1}",
+            "post_nr": f"{i % 9000 + 1000:04d}",
+            "city": "Oslo",
+            "employees": i % 500,
+            "homepage": f"www.bedrift{i}.no",
+            "nace_code": "41.200",
+            "nace_description": "Oppføring av bygninger",
+            "company_summary": f"Bedrift {i} AS er et registrert norsk selskap.",
+            "revenue_2024": f"{i * 1000} kr",
+            "tender_deadline": "15.11.2026",
+        }
+
+
+def _peak_rss_mib():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    counts = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>8} {'seconds':>9} {'rows/s':>10} {'MiB out':>9} {'peak RSS MiB':>13}")
+        for n in counts:
+            path = os.path.join(tmp, f"roster_{n}.xlsx")
+            start = time.perf_counter()
+            write_roster(_rows(n), output=path)
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(path) / (1024 * 1024)
+            print(f"{n:>8} {elapsed:>9.2f} {n / elapsed:>10.0f} {size:>9.1f} {_peak_rss_mib():>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: per-fill latency of fill_excel with and without a TemplatePool.
+
+Fills are spaced out by a short pause, as in interactive use, so the
+background worker has time to refill the pool between fills.
+
+Usage:
+    python -m benchmarks.bench_template_pool [template.xlsx] [runs] [pause_ms]
+"""
+import statistics
+import sys
+import time
+
+from app_modules.excel_filler import fill_excel, TemplatePool
+
+DEFAULT_TEMPLATE = "Filled in with Tangen-Bygg-AS.xlsx"
+
+SAMPLE_FIELDS = {
+    "company_name": "Tangen Bygg AS",
+    "org_number": "123456789",
+    "city": "Oslo",
+}
+
+
+def _measure(template_bytes, runs, pause, pool=None):
+    timings = []
+    for _ in range(runs):
+        time.sleep(pause)
+        start = time.perf_counter()
+        fill_excel(template_bytes, SAMPLE_FIELDS, "Sammendrag", pool=pool)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label, timings):
+    p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+    print(f"{label:<12} median {statistics.median(timings):7.1f} ms   p95 {p95:7.1f} ms")
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TEMPLATE
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    pause = (int(sys.argv[3]) if len(sys.argv) > 3 else 300) / 1000
+
+    with open(path, "rb") as f:
+        template_bytes = f.read()
+
+    _report("no pool", _measure(template_bytes, runs, pause))
+
+    with TemplatePool(template_bytes, size=4) as pool:
+        time.sleep(pause * 4)  # let the worker fill the pool
+        _report("pool", _measure(template_bytes, runs, pause, pool=pool))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+End-to-end load test of the main page flow against local stub servers.
+
+Each simulated user is one Streamlit session: it downloads the template
+once (retrying on later flows until it succeeds), then repeatedly runs
+search -> select -> fetch -> summary -> PDF upload -> fill. Users run on
+threads, like Streamlit sessions do in one server process.
+
+NOTE: the flow in _run_flow() is a hand-written copy of the backend calls
+main_page.run makes (Streamlit's AppTest cannot drive the PDF upload).
+Keep it in sync when main_page.run changes.
+
+A flow counts as failed when a step the page cannot do without fails
+(search, company fetch, template download) and as degraded when an
+optional upstream call (Wikipedia / DuckDuckGo) returned an error.
+
+Usage:
+    python -m benchmarks.loadtest --users 20 --iterations 10 \\
+        [--latency-ms 50] [--jitter-ms 20] [--error-rate 0.01] [--pool]
+
+Without --base-url a stub server is started in-process.
+"""
+import argparse
+import hashlib
+import os
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.stub_server import start_in_background, url_overrides
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_PDF = os.path.join(HERE, "fixtures", "tender.pdf")
+
+STEPS = ["template", "search", "fetch", "summary", "pdf", "fill", "flow"]
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+class _Recorder:
+    def __init__(self):
+        self.timings = defaultdict(list)
+        self.failures = defaultdict(int)
+        self.degraded = 0
+        self._lock = threading.Lock()
+
+    def add(self, step, seconds):
+        with self._lock:
+            self.timings[step].append(seconds * 1000)
+
+    def fail(self, step):
+        with self._lock:
+            self.failures[step] += 1
+
+    def degrade(self):
+        with self._lock:
+            self.degraded += 1
+
+
+# ---------------------------------------------------------
+# Upstream error tracking (per thread, i.e. per simulated user)
+# ---------------------------------------------------------
+# The app modules swallow HTTP errors and fall back, so the driver watches
+# every response sent on the current thread instead.
+_http = threading.local()
+_original_send = requests.Session.send
+
+
+def _tracking_send(self, request, **kwargs):
+    try:
+        response = _original_send(self, request, **kwargs)
+    except Exception:
+        _http.errors = getattr(_http, "errors", 0) + 1
+        raise
+    if response.status_code >= 500:
+        _http.errors = getattr(_http, "errors", 0) + 1
+    return response
+
+
+def _upstream_errors():
+    return getattr(_http, "errors", 0)
+
+
+# ---------------------------------------------------------
+# Shared template pools (one per template, as in main_page)
+# ---------------------------------------------------------
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _shared_pool(template_bytes):
+    from app_modules.excel_filler import TemplatePool
+
+    key = hashlib.sha256(template_bytes).hexdigest()
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = TemplatePool(template_bytes, size=2)
+        return _pools[key]
+
+
+def _run_flow(session, pdf_bytes, use_pool, rec):
+    """One pass through the main page. Returns True if the flow completed."""
+    # Imported here so the URL overrides are in the environment first
+    from app_modules.company_data import search_brreg_live, fetch_company_by_org, format_company_data
+    from app_modules.summary import generate_company_summary
+    from app_modules.pdf_parser import extract_fields_from_pdf
+    from app_modules.excel_filler import fill_excel
+    from app_modules.template_loader import fetch_template_bytes
+
+    flow_start = t = time.perf_counter()
+
+    # Template: cached per session after the first successful download
+    if session.get("template_bytes") is None:
+        try:
+            session["template_bytes"] = fetch_template_bytes()
+        except Exception:
+            rec.fail("template")
+            return False
+        rec.add("template", time.perf_counter() - t)
+    template_bytes = session["template_bytes"]
+
+    t = time.perf_counter()
+    results = search_brreg_live("Tangen")
+    rec.add("search", time.perf_counter() - t)
+    if not results:
+        rec.fail("search")
+        return False
+    selected = random.choice(results)
+
+    t = time.perf_counter()
+    org_number = selected.get("organisasjonsnummer")
+    raw = fetch_company_by_org(org_number) if org_number else selected
+    if raw is None:
+        rec.fail("fetch")
+        return False
+    company_data = format_company_data(raw)
+    rec.add("fetch", time.perf_counter() - t)
+
+    errors_before = _upstream_errors()
+    t = time.perf_counter()
+    summary_text = generate_company_summary(company_data)
+    rec.add("summary", time.perf_counter() - t)
+    if _upstream_errors() > errors_before:
+        rec.degrade()
+
+    t = time.perf_counter()
+    pdf_fields = extract_fields_from_pdf(pdf_bytes)
+    rec.add("pdf", time.perf_counter() - t)
+
+    merged_fields = {}
+    merged_fields.update(company_data)
+    merged_fields.update(pdf_fields)
+    merged_fields["company_summary"] = summary_text
+
+    t = time.perf_counter()
+    pool = _shared_pool(template_bytes) if use_pool else None
+    fill_excel(template_bytes, merged_fields, summary_text, pool=pool)
+    rec.add("fill", time.perf_counter() - t)
+
+    rec.add("flow", time.perf_counter() - flow_start)
+    return True
+
+
+def _simulate_user(iterations, pdf_bytes, use_pool, rec):
+    session = {}
+    for _ in range(iterations):
+        _run_flow(session, pdf_bytes, use_pool, rec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the main page flow.")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--base-url", help="Use an already running stub server")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--pool", action="store_true", help="Fill with a shared TemplatePool")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server, base_url = start_in_background(
+            latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate
+        )
+    os.environ.update(url_overrides(base_url.rstrip("/")))
+
+    with open(SAMPLE_PDF, "rb") as f:
+        pdf_bytes = f.read()
+
+    requests.Session.send = _tracking_send
+
+    rec = _Recorder()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as executor:
+        futures = [
+            executor.submit(_simulate_user, args.iterations, pdf_bytes, args.pool, rec)
+            for _ in range(args.users)
+        ]
+        for fut in futures:
+            fut.result()
+    elapsed = time.perf_counter() - start
+
+    requests.Session.send = _original_send
+    for pool in _pools.values():
+        pool.close()
+    if server:
+        server.shutdown()
+
+    print(f"{'step':<8} {'n':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for step in STEPS:
+        values = rec.timings.get(step)
+        if not values:
+            continue
+        print(
+            f"{step:<8} {len(values):>6} {statistics.median(values):>9.1f} "
+            f"{_percentile(values, 90):>9.1f} {_percentile(values, 99):>9.1f} {max(values):>9.1f}"
+        )
+
+    completed = len(rec.timings.get("flow", []))
+    failed = sum(rec.failures.values())
+    by_step = ", ".join(f"{step}: {n}" for step, n in sorted(rec.failures.items()))
+    print(
+        f"\n{completed} flows completed in {elapsed:.1f}s ({completed / elapsed:.2f} flows/s), "
+        f"{rec.degraded} of them degraded"
+    )
+    print(f"{failed} flows failed" + (f" ({by_step})" if by_step else ""))
+
+
+if __name__ == "__main__":
+    main()
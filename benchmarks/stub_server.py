@@ -0,0 +1,151 @@
+"""
+Local stand-ins for Brreg, Wikipedia, DuckDuckGo and the template URL.
+
+Replays the responses in fixtures/recorded_responses.json (and the repo's
+example workbook as the template) with injectable latency and error rate,
+so the app can be load tested without touching public APIs.
+
+Routes:
+    /brreg/enheter          Brreg search
+    /brreg/enheter/<orgnr>  Brreg entity
+    /wikipedia/<name>       Wikipedia summary
+    /duckduckgo/            DuckDuckGo instant answer
+    /template.xlsx          Excel template
+
+Usage:
+    python -m benchmarks.stub_server [--port 8765] [--latency-ms 50] [--error-rate 0.01]
+
+Point the app at it with the environment variables printed on startup.
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, "fixtures", "recorded_responses.json")
+TEMPLATE = os.path.join(HERE, os.pardir, "Filled in with Tangen-Bygg-AS.xlsx")
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def url_overrides(base_url):
+    """Environment variables that point the app modules at a stub server."""
+    return {
+        "BRREG_SEARCH_URL": f"{base_url}/brreg/enheter",
+        "BRREG_ENTITY_URL": f"{base_url}/brreg/enheter/{{}}",
+        "WIKIPEDIA_SUMMARY_URL": f"{base_url}/wikipedia/{{}}",
+        "DUCKDUCKGO_URL": f"{base_url}/duckduckgo/",
+        "TEMPLATE_URL": f"{base_url}/template.xlsx",
+    }
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # Set on the subclass built by make_server()
+    fixtures = None
+    template_bytes = None
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+        if random.random() < self.error_rate:
+            self._send(503, {"error": "injected failure"})
+            return
+
+        path = urlparse(self.path).path.rstrip("/")
+        enheter = self.fixtures["brreg_search"]["_embedded"]["enheter"]
+
+        if path == "/brreg/enheter":
+            self._send(200, self.fixtures["brreg_search"])
+
+        elif path.startswith("/brreg/enheter/"):
+            org = path.rsplit("/", 1)[-1]
+            match = next((e for e in enheter if e["organisasjonsnummer"] == org), None)
+            if match:
+                self._send(200, match)
+            else:
+                self._send(404, {"feilmelding": "Ingen enhet funnet"})
+
+        elif path.startswith("/wikipedia/"):
+            self._send(200, self.fixtures["wikipedia_summary"])
+
+        elif path == "/duckduckgo":
+            self._send(200, self.fixtures["duckduckgo"])
+
+        elif path == "/template.xlsx":
+            self._send(200, self.template_bytes, XLSX_MIME)
+
+        else:
+            self._send(404, {"error": "unknown route"})
+
+
+def make_server(port=0, latency_ms=0, jitter_ms=0, error_rate=0.0):
+    """Builds a stub server; port=0 picks a free port."""
+
+    with open(FIXTURES, encoding="utf-8") as f:
+        fixtures = json.load(f)
+    with open(TEMPLATE, "rb") as f:
+        template_bytes = f.read()
+
+    handler = type("StubHandler", (_StubHandler,), {
+        "fixtures": fixtures,
+        "template_bytes": template_bytes,
+        "latency": latency_ms / 1000,
+        "jitter": jitter_ms / 1000,
+        "error_rate": error_rate,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(**kwargs):
+    """Starts a stub server on a thread. Returns (server, base_url)."""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run local stand-ins for the external APIs.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.latency_ms, args.jitter_ms, args.error_rate)
+    host, port = server.server_address
+    for key, value in url_overrides(f"http://{host}:{port}").items():
+        print(f"export {key}='{value}'")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
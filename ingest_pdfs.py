@@ -0,0 +1,286 @@
+"""
+Headless bulk ingestion of tender PDFs.
+
+Extracts fields from every PDF in a folder on a process pool and appends
+one JSON record per document to a JSONL file. Documents whose hash is
+already in the output file are skipped, so re-runs only pick up new files
+and an interrupted run resumes where it stopped.
+
+Each record has a status: "ok", "no_text" (PDF parsed but had no text)
+or "error" (PDF could not be parsed). Errors are recorded once; the file
+is tried again only when its content changes (new hash) or when the
+command is run with --retry-errors, which appends a new record.
+If a worker process dies, the documents it had in flight are recorded as
+errors and --watch carries on with a new process pool.
+
+Usage:
+    python ingest_pdfs.py INPUT_DIR OUTPUT.jsonl [--workers N] [--watch SECONDS] [--retry-errors]
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from app_modules import profiling
+from app_modules.pdf_parser import read_pdf_text, extract_fields_from_text
+
+
+# ---------------------------------------------------------
+# HELPERS
+# ---------------------------------------------------------
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_processed_hashes(jsonl_path, retry_errors=False):
+    """
+    Returns the set of hashes already in the output file.
+    A half-written last line from a crash is ignored. With retry_errors,
+    hashes whose latest record is an "error" are left out so they are
+    processed again.
+    """
+
+    status = {}
+    if not os.path.exists(jsonl_path):
+        return set()
+
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                status[record["sha256"]] = record.get("status")
+            except (ValueError, KeyError, TypeError):
+                continue
+
+    return {
+        digest for digest, st in status.items()
+        if not (retry_errors and st == "error")
+    }
+
+
+class HashCache:
+    """Remembers (size, mtime) -> sha256 per path, so watch passes only
+    re-read files that are new or have changed."""
+
+    def __init__(self):
+        self._entries = {}
+
+    def sha256(self, path):
+        st = os.stat(path)
+        key = (st.st_size, st.st_mtime_ns)
+        cached = self._entries.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        digest = file_sha256(path)
+        self._entries[path] = (key, digest)
+        return digest
+
+    def prune(self, paths):
+        for path in set(self._entries) - set(paths):
+            del self._entries[path]
+
+
+def find_pdfs(input_dir):
+    return sorted(
+        os.path.join(root, name)
+        for root, _, files in os.walk(input_dir)
+        for name in files
+        if name.lower().endswith(".pdf")
+    )
+
+
+# ---------------------------------------------------------
+# WORKER (runs in a separate process)
+# ---------------------------------------------------------
+def _extract(path, sha256):
+    start = time.perf_counter()
+    record = {"sha256": sha256, "file": path}
+
+    try:
+        with open(path, "rb") as f:
+            text = read_pdf_text(f.read())
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}", fields={})
+    else:
+        fields = extract_fields_from_text(text)
+        record.update(status="ok" if text.strip() else "no_text", fields=fields)
+
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def _error_record(path, sha256, e):
+    return {
+        "sha256": sha256,
+        "file": path,
+        "status": "error",
+        "error": f"{type(e).__name__}: {e}",
+        "fields": {},
+        "seconds": 0.0,
+    }
+
+
+def _run_inline(path, sha256):
+    try:
+        return _extract(path, sha256)
+    except Exception as e:
+        return _error_record(path, sha256, e)
+
+
+def _result_or_error(fut, path, sha256):
+    try:
+        return fut.result()
+    except Exception as e:
+        return _error_record(path, sha256, e)
+
+
+# ---------------------------------------------------------
+# ONE PASS OVER THE FOLDER
+# ---------------------------------------------------------
+def ingest_once(input_dir, output_path, executor, done, hashes=None,
+                min_age=0.0, processed=None):
+    """
+    Processes every PDF in input_dir whose hash is not in `done`, on
+    `executor` or inline in this process when it is None. Every written
+    record, including errors, adds its hash to `done`.
+    Files modified less than `min_age` seconds ago are left for the next
+    pass, so half-copied files are not ingested. Hashes of the documents
+    handled are added to `processed`.
+    Returns the number of documents written.
+    """
+
+    hashes = HashCache() if hashes is None else hashes
+    processed = set() if processed is None else processed
+
+    now = time.time()
+    paths = find_pdfs(input_dir)
+    hashes.prune(paths)
+
+    pending = {}
+    seen = set()
+    for path in paths:
+        try:
+            if now - os.path.getmtime(path) < min_age:
+                continue
+            digest = hashes.sha256(path)
+        except OSError:
+            continue
+        if digest in done or digest in seen:
+            continue
+        pending[path] = digest
+        seen.add(digest)
+
+    if not pending:
+        return 0
+
+    if executor is None:
+        results = (_run_inline(p, d) for p, d in pending.items())
+    else:
+        futures = {executor.submit(_extract, p, d): (p, d) for p, d in pending.items()}
+        results = (_result_or_error(fut, *futures[fut]) for fut in as_completed(futures))
+
+    written = 0
+    with open(output_path, "a", encoding="utf-8") as out:
+        for record in results:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            written += 1
+
+            processed.add(record["sha256"])
+            done.add(record["sha256"])
+            if record["status"] == "error":
+                print(f"Failed: {record['file']}: {record['error']}")
+
+    return written
+
+
+# ---------------------------------------------------------
+# SCAN / WATCH LOOP
+# ---------------------------------------------------------
+def _ingest_loop(args, make_executor, done):
+    """
+    Runs passes until done (or forever with --watch). `make_executor`
+    builds the process pool, or is None to extract inline. If a worker
+    crash breaks the pool, a new one is created for the next pass.
+    """
+
+    total = 0
+    start = time.perf_counter()
+    hashes = HashCache()
+    processed = set()
+    executor = make_executor() if make_executor else None
+
+    try:
+        while True:
+            batch_start = time.perf_counter()
+            try:
+                n = ingest_once(
+                    args.input_dir, args.output, executor, done,
+                    hashes=hashes, min_age=2.0 if args.watch else 0.0,
+                    processed=processed,
+                )
+            except BrokenProcessPool:
+                print("Worker pool broke; starting a new one")
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = make_executor()
+                n = 0
+            total += n
+            profiling.tag(pdf_digests=processed)
+            if n:
+                elapsed = time.perf_counter() - batch_start
+                print(f"{n} documents in {elapsed:.1f}s ({n / elapsed:.1f} docs/s)")
+
+            if not args.watch:
+                break
+            time.sleep(args.watch)
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed else 0.0
+    print(f"Done: {total} new documents, {rate:.1f} docs/s")
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract fields from a folder of PDFs to JSONL.")
+    parser.add_argument("input_dir")
+    parser.add_argument("output")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--watch", type=float, metavar="SECONDS",
+        help="Keep running and rescan the folder at this interval"
+    )
+    parser.add_argument(
+        "--retry-errors", action="store_true",
+        help="Process documents again whose last record is an error"
+    )
+    args = parser.parse_args(argv)
+
+    done = load_processed_hashes(args.output, retry_errors=args.retry_errors)
+
+    # When profiling, extract inline in this process so the profile sees it
+    if profiling.is_enabled():
+        with profiling.profile_run("ingest"):
+            _ingest_loop(args, None, done)
+        return
+
+    _ingest_loop(args, lambda: ProcessPoolExecutor(max_workers=args.workers), done)
+
+
+if __name__ == "__main__":
+    main()